@@ -1,28 +1,37 @@
 """Main application entry point for the document RAG system."""
-import argparse
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 
-from src.config import Config
-from src.utils import get_logger
-from src.rag import (
-    build_index,
-    query_documents,
-    interactive_mode,
-)
+COMMANDS = ("build", "query", "interactive")
 
-logger = get_logger(__name__)
+# Options that take a value, mapped to (attribute, converter)
+_VALUE_OPTIONS = {
+    "-q": ("question", str),
+    "--question": ("question", str),
+    "-d": ("data_dir", Path),
+    "--data-dir": ("data_dir", Path),
+}
 
+# Boolean flags, mapped to their attribute
+_FLAG_OPTIONS = {
+    "--rebuild": "rebuild",
+    "--no-sources": "no_sources",
+    "--json": "json",
+}
+
+
+def _build_parser():
+    """Build the argparse parser used for --help and error reporting."""
+    import argparse
 
-def main():
-    """Main application entry point."""
     parser = argparse.ArgumentParser(
         description="Production-grade document RAG system using Docling and LangChain"
     )
 
     parser.add_argument(
         "command",
-        choices=["build", "query", "interactive"],
+        choices=COMMANDS,
         help="Command to execute: build (create index), query (ask question), interactive (chat mode)"
     )
 
@@ -50,7 +59,78 @@ def main():
         help="Don't show source documents in output"
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the query result as JSON"
+    )
+
+    return parser
+
+
+def _parse_args(argv):
+    """Parse command-line arguments.
+
+    The fixed command grammar is walked directly to avoid argparse's setup
+    cost. Anything the fast path does not recognise (help, abbreviations,
+    ``--opt=value`` forms, errors) is handed to argparse so usage and error
+    messages stay identical.
+
+    Args:
+        argv: Command-line arguments without the program name
+
+    Returns:
+        Namespace with command, question, data_dir, rebuild, no_sources and json
+    """
+    args = SimpleNamespace(
+        command=None,
+        question=None,
+        data_dir=None,
+        rebuild=False,
+        no_sources=False,
+        json=False,
+    )
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+
+        if arg in _VALUE_OPTIONS:
+            if i + 1 >= len(argv) or argv[i + 1].startswith("-"):
+                return _build_parser().parse_args(argv)
+            name, convert = _VALUE_OPTIONS[arg]
+            setattr(args, name, convert(argv[i + 1]))
+            i += 2
+            continue
+
+        if arg in _FLAG_OPTIONS:
+            setattr(args, _FLAG_OPTIONS[arg], True)
+        elif arg in COMMANDS and args.command is None:
+            args.command = arg
+        else:
+            return _build_parser().parse_args(argv)
+        i += 1
+
+    if args.command is None:
+        return _build_parser().parse_args(argv)
+
+    return args
+
+
+def main():
+    """Main application entry point."""
+    args = _parse_args(sys.argv[1:])
+
+    # Imported after argument parsing so --help and usage errors skip
+    # loading the configuration and .env file entirely
+    from src.config import Config
+    from src.utils import get_logger
+
+    if args.json:
+        # Keep stdout for the JSON document alone
+        Config.LOG_STREAM = "stderr"
+
+    logger = get_logger(__name__)
 
     try:
         # Validate configuration
@@ -58,16 +138,28 @@ def main():
 
         if args.command == "build":
             if not args.data_dir:
-                parser.error("--data-dir is required for 'build' command")
-                
+                _build_parser().error("--data-dir is required for 'build' command")
+
+            from src.rag import build_index
             build_index(data_dir=args.data_dir, force_rebuild=args.rebuild)
 
         elif args.command == "query":
             if not args.question:
-                parser.error("--question is required for 'query' command")
+                _build_parser().error("--question is required for 'query' command")
 
+            from src.rag import query_documents
             result = query_documents(args.question, load_existing=not args.rebuild)
 
+            from src.utils import flush_logs
+            flush_logs()
+
+            if args.json:
+                from src.utils import dumps_json
+                if args.no_sources:
+                    result = {"question": result["question"], "answer": result["answer"]}
+                sys.stdout.buffer.write(dumps_json(result) + b"\n")
+                return
+
             print("\n" + "=" * 80)
             print(f"Question: {result['question']}")
             print("=" * 80)
@@ -81,6 +173,7 @@ def main():
                     print(f"    {source['content'][:200]}...")
 
         elif args.command == "interactive":
+            from src.rag import interactive_mode
             interactive_mode()
 
     except KeyboardInterrupt:
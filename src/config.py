@@ -1,5 +1,6 @@
 """Configuration management for the RAG system."""
 import os
+import sys
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
@@ -28,7 +29,45 @@ class Config:
 
     # Vector Database Configuration
     MILVUS_COLLECTION_NAME: str = "docusearch_documents"
-    MILVUS_INDEX_TYPE: str = "FLAT"
+    # Optional Milvus server URI; defaults to a local Milvus Lite file in VECTOR_DB_DIR.
+    # Milvus Lite only builds FLAT indexes, so index tuning applies to a server.
+    MILVUS_URI: Optional[str] = os.getenv("MILVUS_URI")
+    # HNSW, HNSW_SQ, IVF_FLAT, IVF_SQ8, or AUTO to pick HNSW, IVF_SQ8 or IVF_PQ by corpus size
+    MILVUS_INDEX_TYPE: str = os.getenv("MILVUS_INDEX_TYPE", "HNSW")
+    # Embeddings are L2-normalized, so inner product is equivalent to cosine
+    MILVUS_METRIC_TYPE: str = "IP"
+
+    # HNSW index parameters
+    HNSW_M: int = int(os.getenv("HNSW_M", "16"))
+    HNSW_EF_CONSTRUCTION: int = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+    HNSW_EF: int = int(os.getenv("HNSW_EF", "64"))
+
+    # IVF index parameters (IVF_FLAT, IVF_SQ8). Search cost scales with
+    # nlist + nprobe * N / nlist, so raise nlist with the corpus size.
+    IVF_NLIST: int = int(os.getenv("IVF_NLIST", "1024"))
+    IVF_NPROBE: int = int(os.getenv("IVF_NPROBE", "16"))
+
+    # Vector quantization for MILVUS_INDEX_TYPE=HNSW_SQ: SQ8 (int8), FP16, BF16 or SQ6
+    MILVUS_SQ_TYPE: str = os.getenv("MILVUS_SQ_TYPE", "SQ8")
+
+    # Embedding Configuration
+    EMBED_BATCH_SIZE: int = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+    # Embedding device ("auto", "cpu", "cuda", ...) and dtype ("auto", "float32",
+    # "float16", "bfloat16"); "auto" uses float16 on CUDA and float32 on CPU
+    EMBED_DEVICE: str = os.getenv("EMBED_DEVICE", "auto")
+    EMBED_DTYPE: str = os.getenv("EMBED_DTYPE", "auto")
+    # CPU threads used by the embedding model; 0 keeps the library default
+    EMBED_NUM_THREADS: int = int(os.getenv("EMBED_NUM_THREADS", "0"))
+    # "huggingface" (sentence-transformers on PyTorch) or "onnx" (ONNX Runtime)
+    EMBED_BACKEND: str = os.getenv("EMBED_BACKEND", "huggingface")
+    # Directory of the exported ONNX model and tokenizer for EMBED_BACKEND=onnx
+    ONNX_MODEL_DIR: Path = Path(os.getenv(
+        "ONNX_MODEL_DIR",
+        str(PROJECT_ROOT / "models" / EMBED_MODEL_ID.rsplit("/", 1)[-1])
+    ))
+
+    # Cache parsed documents and chunk embeddings under VECTOR_DB_DIR
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
 
     # Chunking Configuration
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "512"))
@@ -37,8 +76,30 @@ class Config:
     # Retrieval Configuration
     TOP_K: int = int(os.getenv("TOP_K", "5"))
 
+    # LRU cache size for retrieved context and answers (per pipeline) and for
+    # similarity_search results (per vector store); 0 disables
+    QUERY_CACHE_SIZE: int = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+    # Seconds a cached similarity search result stays valid
+    SEARCH_CACHE_TTL: float = float(os.getenv("SEARCH_CACHE_TTL", "600"))
+
+    # Re-score TOP_K * RERANK_FAN_OUT candidates with exact cosine similarity (1 disables)
+    RERANK_FAN_OUT: int = int(os.getenv("RERANK_FAN_OUT", "1"))
+    # Compile the numba rerank kernel when the pipeline starts instead of on first query
+    NUMBA_WARMUP: bool = os.getenv("NUMBA_WARMUP", "false").lower() == "true"
+
+    # Also store sign-hashed binary codes for similarity_search_two_stage
+    BINARY_INDEX_ENABLED: bool = os.getenv("BINARY_INDEX_ENABLED", "false").lower() == "true"
+
+    # Maximum number of questions processed concurrently by batch_query
+    MAX_CONCURRENCY: int = int(os.getenv("MAX_CONCURRENCY", "8"))
+
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # "text" for human-readable lines or "json" for one JSON object per line
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    # Console stream for log lines and startup notices: "stdout" or "stderr"
+    # (query --json switches to stderr so stdout carries only the JSON)
+    LOG_STREAM: str = os.getenv("LOG_STREAM", "stdout")
 
     # RAG Prompt Template
     RAG_PROMPT_TEMPLATE: str = """Context information is below.
@@ -58,20 +119,42 @@ Answer:"""
     # Disable tokenizers parallelism warning
     os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
+    # Size the OpenMP/BLAS thread pools before numpy or torch is imported, so
+    # concurrent searches don't each fan out across every core (src.rag imports
+    # this module before any of its submodules)
+    if EMBED_NUM_THREADS > 0:
+        os.environ.setdefault("OMP_NUM_THREADS", str(EMBED_NUM_THREADS))
+        os.environ.setdefault("MKL_NUM_THREADS", str(EMBED_NUM_THREADS))
+        os.environ.setdefault("OPENBLAS_NUM_THREADS", str(EMBED_NUM_THREADS))
+
+    # Directories already created by ensure_directories
+    _dirs_ready: Optional[tuple] = None
+
     @classmethod
     def ensure_directories(cls) -> None:
-        """Ensure required directories exist."""
+        """Ensure required directories exist.
+
+        Only touches the filesystem when the configured directories change
+        (DATA_DIR can be overridden per build), so repeated builds in
+        interactive mode skip the mkdir calls.
+        """
+        dirs = (cls.VECTOR_DB_DIR, cls.DATA_DIR)
+        if dirs == cls._dirs_ready:
+            return
+
         cls.VECTOR_DB_DIR.mkdir(exist_ok=True)
         cls.DATA_DIR.mkdir(exist_ok=True)
+        cls._dirs_ready = dirs
 
     @classmethod
     def get_milvus_uri(cls) -> str:
         """Get Milvus database URI."""
-        return str(cls.VECTOR_DB_DIR / "milvus.db")
+        return cls.MILVUS_URI or str(cls.VECTOR_DB_DIR / "milvus.db")
 
     @classmethod
     def validate(cls) -> None:
         """Validate configuration."""
-        print(f"INFO: Using Ollama model: {cls.OLLAMA_MODEL}")
-        print(f"INFO: Ollama URL: {cls.OLLAMA_BASE_URL}")
-        print("INFO: Make sure Ollama is running. Install from: https://ollama.ai")
+        out = sys.stderr if cls.LOG_STREAM == "stderr" else sys.stdout
+        print(f"INFO: Using Ollama model: {cls.OLLAMA_MODEL}", file=out)
+        print(f"INFO: Ollama URL: {cls.OLLAMA_BASE_URL}", file=out)
+        print("INFO: Make sure Ollama is running. Install from: https://ollama.ai", file=out)
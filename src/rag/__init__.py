@@ -1,16 +1,40 @@
-"""RAG module for document search and question answering."""
-from src.rag.document_loader import DocumentScanner, load_documents_from_directory
-from src.rag.vector_store import VectorStoreManager
-from src.rag.rag import RAGPipeline, create_rag_pipeline
-from src.rag.cli import build_index, query_documents, interactive_mode
-
-__all__ = [
-    "DocumentScanner",
-    "load_documents_from_directory",
-    "VectorStoreManager",
-    "RAGPipeline",
-    "create_rag_pipeline",
-    "build_index",
-    "query_documents",
-    "interactive_mode",
-]
+"""RAG module for document search and question answering.
+
+Attributes are imported lazily (PEP 562) so that importing the package does
+not pull in docling, torch or langchain until they are actually used.
+
+Config is imported eagerly: it pins the OpenMP/BLAS thread pools from
+EMBED_NUM_THREADS, which only takes effect before numpy is first imported,
+and every submodule that imports numpy is loaded after this package.
+"""
+import importlib
+
+import src.config  # noqa: F401
+
+_LAZY = {
+    "DocumentScanner": "src.rag.document_loader",
+    "load_documents_from_directory": "src.rag.document_loader",
+    "VectorStoreManager": "src.rag.vector_store",
+    "RAGPipeline": "src.rag.rag",
+    "create_rag_pipeline": "src.rag.rag",
+    "build_index": "src.rag.cli",
+    "query_documents": "src.rag.cli",
+    "interactive_mode": "src.rag.cli",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    """Import the requested attribute on first access and cache it."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List lazily importable attributes alongside loaded ones."""
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,99 @@
+"""Bit-packed companion collection for coarse two-stage retrieval.
+
+Each embedding is sign-hashed to one bit per dimension (32x smaller than
+float32) and stored in a ``BINARY_VECTOR`` collection next to the main one,
+keyed by the main collection's primary key. An exact (BIN_FLAT) Hamming scan
+over the codes picks a candidate set cheaply; the caller then re-scores the
+candidates with their float32 vectors.
+"""
+from typing import Any, List, Sequence
+
+import numpy as np
+from pymilvus import Collection, CollectionSchema, DataType, FieldSchema, utility
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def binary_codes(vectors: Sequence[Sequence[float]]) -> List[bytes]:
+    """Sign-hash vectors into packed bit codes, one bit per dimension.
+
+    Args:
+        vectors: Embedding vectors
+
+    Returns:
+        Packed codes, one bytes object per vector
+    """
+    bits = np.packbits(np.asarray(vectors, dtype=np.float32) > 0, axis=1)
+    return [row.tobytes() for row in bits]
+
+
+class BinaryIndex:
+    """Hamming-distance index of sign-hashed embeddings."""
+
+    def __init__(self, name: str, dim: int, using: str):
+        """Open and load the binary collection, creating it if it does not exist.
+
+        Args:
+            name: Collection name
+            dim: Embedding dimension (must be a multiple of 8)
+            using: pymilvus connection alias shared with the main collection
+        """
+        self.name = name
+
+        if utility.has_collection(name, using=using):
+            self.col = Collection(name, using=using)
+            self.col.load()
+            return
+
+        logger.info("Creating binary index collection: %s (dim=%d)", name, dim)
+        schema = CollectionSchema([
+            FieldSchema("pk", DataType.INT64, is_primary=True, auto_id=False),
+            FieldSchema("code", DataType.BINARY_VECTOR, dim=dim),
+        ])
+        self.col = Collection(name, schema, using=using)
+        # Codes are 32x smaller than the float vectors, so a flat scan stays
+        # cheap and, unlike IVF, needs no nlist/nprobe tuned to this collection
+        self.col.create_index("code", {"index_type": "BIN_FLAT", "metric_type": "HAMMING"})
+        self.col.load()
+
+    @staticmethod
+    def drop(name: str, using: str) -> None:
+        """Drop a binary collection if it exists.
+
+        Args:
+            name: Collection name
+            using: pymilvus connection alias
+        """
+        if utility.has_collection(name, using=using):
+            # Free the loaded segments before dropping
+            Collection(name, using=using).release()
+            utility.drop_collection(name, using=using)
+
+    def insert(self, pks: Sequence[Any], vectors: Sequence[Sequence[float]]) -> None:
+        """Add codes for rows of the main collection.
+
+        Args:
+            pks: Primary keys of the rows in the main collection
+            vectors: Their embedding vectors
+        """
+        self.col.insert([list(pks), binary_codes(vectors)])
+
+    def search(self, vector: Sequence[float], limit: int) -> List[Any]:
+        """Find the rows whose codes are nearest to a query's code.
+
+        Args:
+            vector: Query embedding
+            limit: Number of candidates to return
+
+        Returns:
+            Primary keys of the candidates, nearest first
+        """
+        hits = self.col.search(
+            data=binary_codes([vector]),
+            anns_field="code",
+            param={"metric_type": "HAMMING"},
+            limit=limit,
+        )[0]
+        return [hit.id for hit in hits]
@@ -1,10 +1,11 @@
 """CLI functions for the document RAG system."""
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+from langchain_core.documents import Document
 
 from src.config import Config
-from src.utils import get_logger
+from src.utils import flush_logs, get_logger
 from src.rag.document_loader import DocumentScanner
 from src.rag.vector_store import VectorStoreManager
 from src.rag.rag import RAGPipeline
@@ -12,6 +13,20 @@ from src.rag.rag import RAGPipeline
 logger = get_logger(__name__)
 
 
+def _flush(vector_store_manager: VectorStoreManager, documents: List[Document], drop_old: bool) -> None:
+    """Write a buffer of chunks to the vector store, creating it on first use.
+
+    Args:
+        vector_store_manager: Vector store manager to write to
+        documents: Buffered document chunks
+        drop_old: Whether to drop an existing collection when creating it
+    """
+    if vector_store_manager.vectorstore is None:
+        vector_store_manager.create_vectorstore(documents, drop_old=drop_old)
+    else:
+        vector_store_manager.add_documents(documents)
+
+
 def build_index(data_dir: Optional[Path] = None, force_rebuild: bool = False) -> VectorStoreManager:
     """Build or rebuild the document index.
 
@@ -33,21 +48,35 @@ def build_index(data_dir: Optional[Path] = None, force_rebuild: bool = False) ->
     # Ensure directories exist
     Config.ensure_directories()
     
-    # Load documents
-    logger.info("Step 1: Loading documents from directory")
+    # Load documents and stream them into the vector store as they are parsed,
+    # so only one flush buffer of chunks is held in memory at a time
+    logger.info("Step 1: Initializing vector store and embeddings")
     scanner = DocumentScanner(data_dir=data_dir)
-    documents = scanner.load_all_documents()
+    vector_store_manager = VectorStoreManager()
+
+    logger.info("Step 2: Loading and indexing documents")
+    flush_size = Config.EMBED_BATCH_SIZE * 4
+    buffer = []
+    num_chunks = 0
+
+    for docs in scanner.iter_documents():
+        buffer.extend(docs)
+        if len(buffer) >= flush_size:
+            _flush(vector_store_manager, buffer, force_rebuild)
+            num_chunks += len(buffer)
+            buffer = []
 
-    if not documents:
+    if buffer:
+        _flush(vector_store_manager, buffer, force_rebuild)
+        num_chunks += len(buffer)
+
+    if num_chunks == 0:
         logger.error("No documents found or loaded. Please add documents to the data directory.")
         sys.exit(1)
 
-    logger.info(f"Successfully loaded {len(documents)} document chunks")
+    vector_store_manager.tune_index()
 
-    # Create vector store
-    logger.info("Step 2: Creating vector store and embeddings")
-    vector_store_manager = VectorStoreManager()
-    vector_store_manager.create_vectorstore(documents, drop_old=force_rebuild)
+    logger.info(f"Successfully indexed {num_chunks} document chunks")
 
     logger.info("=" * 80)
     logger.info("Index built successfully!")
@@ -89,7 +118,7 @@ def query_documents(question: str, load_existing: bool = True) -> dict:
     rag = RAGPipeline(vector_store_manager)
 
     # Query
-    logger.info(f"Question: {question}")
+    logger.debug("Question: %.64s", question, extra={"query_len": len(question)})
     result = rag.query(question)
 
     return result
@@ -118,6 +147,7 @@ def interactive_mode():
 
     while True:
         try:
+            flush_logs()
             question = input("\nYour question: ").strip()
 
             if question.lower() in ["exit", "quit"]:
@@ -135,6 +165,7 @@ def interactive_mode():
 
             result = rag.query(question)
 
+            flush_logs()
             print("\n" + "=" * 80)
             print(f"Question: {result['question']}")
             print("=" * 80)
@@ -1,6 +1,13 @@
 """Document loader for scanning and loading documents from the data directory."""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from langchain_core.documents import Document
 from langchain_docling import DoclingLoader
 from langchain_docling.loader import ExportType
@@ -8,9 +15,81 @@ from docling.chunking import HybridChunker
 
 from src.config import Config
 from src.utils import get_logger
+from src.rag.embed_cache import ParseCache
 
 logger = get_logger(__name__)
 
+# Supported extensions without the leading dot, for suffix checks on raw names
+_SUPPORTED = frozenset(ext[1:] for ext in Config.SUPPORTED_EXTENSIONS)
+
+
+@lru_cache(maxsize=2)
+def _get_chunker(tokenizer_id: str) -> HybridChunker:
+    """Get a chunker for the given tokenizer, loading the tokenizer only once per process.
+
+    Args:
+        tokenizer_id: HuggingFace tokenizer/model ID
+
+    Returns:
+        Shared HybridChunker instance
+    """
+    return HybridChunker(tokenizer=tokenizer_id)
+
+
+def _load_one(
+    file_path: Path,
+    export_type: ExportType,
+) -> Tuple[Path, Optional[List[Document]], Optional[str]]:
+    """Load a single document in a worker process.
+
+    Uses a per-process cached chunker so the tokenizer never has to be
+    pickled across the process boundary and is loaded only for the first
+    file each worker handles. Exceptions are caught and returned so one bad
+    file does not tear down the whole pool.
+
+    Args:
+        file_path: Path to the document
+        export_type: Type of export for document processing
+
+    Returns:
+        Tuple of (file path, document chunks or None, error message or None)
+    """
+    try:
+        chunker = _get_chunker(Config.EMBED_MODEL_ID)
+        return file_path, _load_file(file_path, export_type, chunker), None
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+def _load_file(file_path: Path, export_type: ExportType, chunker: HybridChunker) -> List[Document]:
+    """Parse and chunk a single document with Docling.
+
+    Args:
+        file_path: Path to the document
+        export_type: Type of export for document processing
+        chunker: Chunker used to split the document
+
+    Returns:
+        List of document chunks
+    """
+    logger.info("Loading document: %s", file_path.name)
+
+    loader = DoclingLoader(
+        file_path=str(file_path),
+        export_type=export_type,
+        chunker=chunker,
+    )
+
+    docs = loader.load()
+    logger.info("Loaded %d chunks from %s", len(docs), file_path.name)
+
+    # Add source metadata
+    for doc in docs:
+        doc.metadata["source_file"] = file_path.name
+        doc.metadata["source_path"] = str(file_path)
+
+    return docs
+
 
 class DocumentScanner:
     """Scans and loads documents from a directory using Docling."""
@@ -19,20 +98,37 @@ class DocumentScanner:
         self,
         data_dir: Optional[Path] = None,
         export_type: ExportType = ExportType.DOC_CHUNKS,
+        max_workers: Optional[int] = None,
+        use_cache: Optional[bool] = None,
     ):
         """Initialize the document scanner.
 
         Args:
             data_dir: Directory containing documents to scan
             export_type: Type of export for document processing
+            max_workers: Number of worker processes used to parse documents
+                (default: number of CPUs)
+            use_cache: Whether to reuse parse results for unchanged files
+                (default: Config.CACHE_ENABLED)
         """
         self.data_dir = data_dir or Config.DATA_DIR
         self.export_type = export_type
-        self.chunker = HybridChunker(tokenizer=Config.EMBED_MODEL_ID)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        if use_cache is None:
+            use_cache = Config.CACHE_ENABLED
+        self.parse_cache = (
+            ParseCache(f"{export_type}:{Config.EMBED_MODEL_ID}") if use_cache else None
+        )
 
         if not self.data_dir.exists():
             raise ValueError(f"Data directory does not exist: {self.data_dir}")
 
+    @property
+    def chunker(self) -> HybridChunker:
+        """Chunker for in-process loading; the tokenizer is loaded on first use."""
+        return _get_chunker(Config.EMBED_MODEL_ID)
+
     def scan_documents(self) -> List[Path]:
         """Scan the data directory for supported documents.
 
@@ -41,14 +137,26 @@ class DocumentScanner:
         """
         documents = []
 
-        logger.info(f"Scanning directory: {self.data_dir}")
-
-        for file_path in self.data_dir.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in Config.SUPPORTED_EXTENSIONS:
-                documents.append(file_path)
-                logger.info(f"Found document: {file_path.name}")
-
-        logger.info(f"Total documents found: {len(documents)}")
+        logger.info("Scanning directory: %s", self.data_dir)
+
+        # Walk with os.scandir so file/dir checks use the cached d_type from
+        # readdir instead of a stat() per entry, and only build a Path for matches
+        log_found = logger.isEnabledFor(logging.INFO)
+        stack = [str(self.data_dir)]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+
+                    stem, dot, ext = entry.name.rpartition(".")
+                    if dot and stem and ext.lower() in _SUPPORTED and entry.is_file():
+                        documents.append(Path(entry.path))
+                        if log_found:
+                            logger.info("Found document: %s", entry.name)
+
+        logger.info("Total documents found: %d", len(documents))
         return documents
 
     def load_document(self, file_path: Path) -> List[Document]:
@@ -61,62 +169,152 @@ class DocumentScanner:
             List of document chunks
         """
         try:
-            logger.info(f"Loading document: {file_path.name}")
-
-            loader = DoclingLoader(
-                file_path=str(file_path),
-                export_type=self.export_type,
-                chunker=self.chunker,
-            )
+            if self.parse_cache is not None:
+                docs = self.parse_cache.get(file_path)
+                if docs is not None:
+                    logger.info("Using cached chunks for %s", file_path.name)
+                    return docs
 
-            docs = loader.load()
-            logger.info(f"Loaded {len(docs)} chunks from {file_path.name}")
-
-            # Add source metadata
-            for doc in docs:
-                doc.metadata["source_file"] = file_path.name
-                doc.metadata["source_path"] = str(file_path)
+            docs = _load_file(file_path, self.export_type, self.chunker)
 
+            if self.parse_cache is not None:
+                self.parse_cache.put(file_path, docs)
             return docs
-
         except Exception as e:
-            logger.error(f"Failed to load document {file_path.name}: {str(e)}")
+            logger.error("Failed to load document %s: %s", file_path.name, e)
             raise
 
-    def load_all_documents(self, file_paths: Optional[List[Path]] = None) -> List[Document]:
-        """Load all documents from the data directory.
+    def iter_documents(self, file_paths: Optional[List[Path]] = None) -> Iterator[List[Document]]:
+        """Yield document chunks one file at a time.
+
+        Unlike load_all_documents, only the chunks of the file currently being
+        consumed are held in memory. Documents that need parsing are dispatched
+        to worker processes up front, so parsing continues in the background
+        while the caller embeds and indexes earlier results. Files that fail to
+        load are logged and skipped.
 
         Args:
             file_paths: Optional list of specific file paths to load
 
-        Returns:
-            List of all document chunks
+        Yields:
+            List of chunks for each successfully loaded document
         """
         if file_paths is None:
             file_paths = self.scan_documents()
 
         if not file_paths:
             logger.warning("No documents found to load")
-            return []
-
-        all_docs = []
-        failed_files = []
+            return
 
+        cached_paths = []
+        to_parse = []
         for file_path in file_paths:
-            try:
-                docs = self.load_document(file_path)
-                all_docs.extend(docs)
-            except Exception as e:
-                logger.error(f"Skipping {file_path.name} due to error: {str(e)}")
-                failed_files.append(file_path.name)
+            if self.parse_cache is not None and self.parse_cache.is_fresh(file_path):
+                cached_paths.append(file_path)
+            else:
+                to_parse.append(file_path)
+
+        num_chunks = 0
+        failed_files = []
 
-        logger.info(f"Successfully loaded {len(all_docs)} total chunks from {len(file_paths) - len(failed_files)} documents")
+        with self._start_pool(to_parse) as results:
+            if cached_paths:
+                logger.info("Reusing cached chunks for %d unchanged documents", len(cached_paths))
+
+            # Serve cache hits while the workers are already busy parsing
+            for file_path in cached_paths:
+                docs = self.parse_cache.get(file_path)
+                if docs is None:
+                    # Changed since the freshness check; fall back to parsing inline
+                    docs = self.load_document(file_path)
+                num_chunks += len(docs)
+                yield docs
+
+            for file_path, docs, error in results:
+                if error is not None:
+                    logger.error("Skipping %s due to error: %s", file_path.name, error)
+                    failed_files.append(file_path.name)
+                    continue
+                if self.parse_cache is not None:
+                    self.parse_cache.put(file_path, docs)
+                num_chunks += len(docs)
+                yield docs
+
+        logger.info(
+            "Successfully loaded %d total chunks from %d documents",
+            num_chunks, len(file_paths) - len(failed_files),
+        )
 
         if failed_files:
-            logger.warning(f"Failed to load {len(failed_files)} documents: {', '.join(failed_files)}")
+            logger.warning("Failed to load %d documents: %s", len(failed_files), ", ".join(failed_files))
 
+    def load_all_documents(self, file_paths: Optional[List[Path]] = None) -> List[Document]:
+        """Load all documents from the data directory.
+
+        Args:
+            file_paths: Optional list of specific file paths to load
+
+        Returns:
+            List of all document chunks
+        """
+        all_docs = []
+        for docs in self.iter_documents(file_paths):
+            all_docs.extend(docs)
         return all_docs
 
+    @contextmanager
+    def _start_pool(
+        self,
+        file_paths: List[Path],
+    ) -> Iterator[Iterator[Tuple[Path, Optional[List[Document]], Optional[str]]]]:
+        """Start parsing documents across worker processes.
+
+        Work is submitted as soon as the context is entered. At most two files
+        per worker are in flight, which bounds how many parsed-but-unconsumed
+        results can pile up when the consumer (embedding) is the slower stage.
+        Results are produced in completion order.
+
+        Args:
+            file_paths: Documents to parse
+
+        Yields:
+            Iterator of (file path, document chunks or None, error message or None)
+        """
+        if not file_paths:
+            yield iter(())
+            return
+
+        workers = min(self.max_workers, len(file_paths))
+        logger.info("Parsing %d documents with %d worker processes", len(file_paths), workers)
+
+        # Docling parsing is CPU-bound and holds the GIL, so fan files out across
+        # processes. Use "spawn" so workers do not inherit torch/tokenizer threads.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            remaining = iter(file_paths)
+            pending = {
+                executor.submit(_load_one, file_path, self.export_type)
+                for file_path in islice(remaining, 2 * workers)
+            }
+
+            def drain():
+                nonlocal pending
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        next_path = next(remaining, None)
+                        if next_path is not None:
+                            pending.add(executor.submit(_load_one, next_path, self.export_type))
+                        yield future.result()
+
+            try:
+                yield drain()
+            finally:
+                for future in pending:
+                    future.cancel()
+
 
 def load_documents_from_directory(data_dir: Optional[Path] = None) -> List[Document]:
     """Convenience function to load all documents from a directory.
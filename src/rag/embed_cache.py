@@ -0,0 +1,251 @@
+"""Persistent on-disk caches for embeddings and parsed documents."""
+import hashlib
+import pickle
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.config import Config
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Stay well below SQLite's bound-parameter limit
+_SQL_BATCH = 500
+
+
+def _default_cache_path() -> Path:
+    """Get the default cache database path."""
+    return Config.VECTOR_DB_DIR / "emb_cache.db"
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    """Open a SQLite connection usable from any thread."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class EmbeddingCache:
+    """Caches embedding vectors keyed by a hash of the model ID and chunk text."""
+
+    _table = "embeddings"
+
+    def __init__(self, model_id: str, path: Optional[Path] = None):
+        """Initialize the embedding cache.
+
+        Args:
+            model_id: ID of the embedding model; namespaces the cache keys
+            path: SQLite database file (default: VECTOR_DB_DIR/emb_cache.db)
+        """
+        self.model_id = model_id
+        self.path = path or _default_cache_path()
+        self._lock = threading.Lock()
+        self._conn = _connect(self.path)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self._table} (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> bytes:
+        """Hash a text into its cache key."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.model_id.encode())
+        h.update(b"\x00")
+        h.update(text.encode())
+        return h.digest()
+
+    def _pack(self, vector: Sequence[float]) -> bytes:
+        """Serialize a vector for storage."""
+        return array("f", vector).tobytes()
+
+    def _unpack(self, blob: bytes) -> List[float]:
+        """Deserialize a stored vector."""
+        return array("f", blob).tolist()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Look up cached vectors for a batch of texts.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Vectors in input order, with None for cache misses
+        """
+        keys = [self._key(text) for text in texts]
+        found = {}
+
+        with self._lock:
+            for start in range(0, len(keys), _SQL_BATCH):
+                chunk = keys[start:start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM {self._table} WHERE key IN ({placeholders})", chunk
+                )
+                found.update(rows)
+
+        results = []
+        for key in keys:
+            blob = found.get(key)
+            results.append(self._unpack(blob) if blob is not None else None)
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store vectors for a batch of texts.
+
+        Args:
+            texts: Texts that were embedded
+            vectors: Embedding vectors, one per text
+        """
+        rows = [(self._key(text), self._pack(vector)) for text, vector in zip(texts, vectors)]
+
+        with self._lock:
+            self._conn.executemany(f"INSERT OR REPLACE INTO {self._table} VALUES (?, ?)", rows)
+            self._conn.commit()
+
+    def embed_documents(
+        self,
+        texts: Sequence[str],
+        embed_fn: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """Embed texts, only invoking the model for cache misses.
+
+        Args:
+            texts: Texts to embed
+            embed_fn: Batch embedding function used for misses
+
+        Returns:
+            Embedding vectors in input order
+        """
+        vectors = self.get_many(texts)
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+
+        if misses:
+            miss_texts = [texts[i] for i in misses]
+            computed = embed_fn(miss_texts)
+            self.put_many(miss_texts, computed)
+            for i, vector in zip(misses, computed):
+                vectors[i] = vector
+
+        logger.debug("Embedding cache: %d hits, %d misses", len(texts) - len(misses), len(misses))
+        return vectors
+
+
+class QueryEmbeddingCache(EmbeddingCache):
+    """Caches query embeddings, stored as float16 to halve their size.
+
+    Queries are kept apart from chunk embeddings, and the float16 round trip
+    is well below the noise of an approximate nearest-neighbour search.
+    """
+
+    _table = "query_embeddings"
+
+    def _pack(self, vector: Sequence[float]) -> bytes:
+        """Serialize a vector as float16."""
+        return np.asarray(vector, dtype=np.float16).tobytes()
+
+    def _unpack(self, blob: bytes) -> List[float]:
+        """Deserialize a float16 vector."""
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+
+    def embed_query(self, text: str, embed_fn: Callable[[str], List[float]]) -> List[float]:
+        """Embed a query, only invoking the model on a cache miss.
+
+        Args:
+            text: Query text
+            embed_fn: Single-query embedding function used on a miss
+
+        Returns:
+            Embedding vector
+        """
+        vector = self.get_many([text])[0]
+        if vector is None:
+            vector = embed_fn(text)
+            self.put_many([text], [vector])
+        return vector
+
+
+class ParseCache:
+    """Caches parsed document chunks keyed by file path, mtime and size."""
+
+    def __init__(self, fingerprint: str, path: Optional[Path] = None):
+        """Initialize the parse cache.
+
+        Args:
+            fingerprint: Identifies the parse settings (export type, tokenizer);
+                entries written with different settings are treated as misses
+            path: SQLite database file (default: VECTOR_DB_DIR/emb_cache.db)
+        """
+        self.fingerprint = fingerprint
+        self.path = path or _default_cache_path()
+        self._lock = threading.Lock()
+        self._conn = _connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, fingerprint TEXT, payload BLOB)"
+        )
+        self._conn.commit()
+
+    def is_fresh(self, file_path: Path) -> bool:
+        """Check whether a file has an up-to-date entry without loading it.
+
+        Args:
+            file_path: Path to the document
+
+        Returns:
+            True if a cached entry matches the file's mtime, size and settings
+        """
+        stat = file_path.stat()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, fingerprint FROM documents WHERE path = ?",
+                (str(file_path),),
+            ).fetchone()
+
+        return row is not None and tuple(row) == (stat.st_mtime_ns, stat.st_size, self.fingerprint)
+
+    def get(self, file_path: Path) -> Optional[List[Document]]:
+        """Get cached chunks for a file if it is unchanged.
+
+        Args:
+            file_path: Path to the document
+
+        Returns:
+            Cached document chunks, or None on a miss
+        """
+        stat = file_path.stat()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, fingerprint, payload FROM documents WHERE path = ?",
+                (str(file_path),),
+            ).fetchone()
+
+        if row is None or tuple(row[:3]) != (stat.st_mtime_ns, stat.st_size, self.fingerprint):
+            return None
+        return pickle.loads(row[3])
+
+    def put(self, file_path: Path, docs: List[Document]) -> None:
+        """Store parsed chunks for a file.
+
+        Args:
+            file_path: Path to the document
+            docs: Parsed document chunks
+        """
+        stat = file_path.stat()
+        payload = pickle.dumps(docs, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?)",
+                (str(file_path), stat.st_mtime_ns, stat.st_size, self.fingerprint, payload),
+            )
+            self._conn.commit()
@@ -0,0 +1,211 @@
+"""ONNX Runtime embeddings for sentence-transformer models.
+
+Export a model once with optimum, optionally quantizing it to int8:
+
+    optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 \
+        --task feature-extraction --optimize O2 models/all-MiniLM-L6-v2-onnx
+
+then set ``EMBED_BACKEND=onnx`` and ``ONNX_MODEL_DIR`` to the export directory.
+If the directory has no model yet, it is exported and dynamically quantized
+to int8 on first use. Requires the ``onnx`` extra (onnxruntime, transformers,
+optimum).
+"""
+import json
+import platform
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.config import Config
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Model files looked up in the export directory, in order of preference
+_MODEL_FILES = ("model_quantized.onnx", "model_optimized.onnx", "model.onnx")
+
+# sentence-transformers pooling config flags, mapped to the modes _encode implements
+_POOLING_MODES = {
+    "pooling_mode_mean_tokens": "mean",
+    "pooling_mode_cls_token": "cls",
+    "pooling_mode_max_tokens": "max",
+}
+
+
+def export_model(model_id: str, model_dir: Path, quantize: bool = True) -> None:
+    """Export a Hugging Face model to ONNX, optionally with int8 dynamic quantization.
+
+    Args:
+        model_id: Hugging Face model ID
+        model_dir: Directory to write the model and tokenizer to
+        quantize: Whether to also write an int8 ``model_quantized.onnx``
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    model_dir = Path(model_dir)
+    logger.info("Exporting %s to ONNX: %s", model_id, model_dir)
+
+    model = ORTModelForFeatureExtraction.from_pretrained(
+        model_id, export=True, provider="CPUExecutionProvider"
+    )
+    model.save_pretrained(model_dir)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(model_dir)
+
+    # Keep the sequence length and pooling the sentence-transformer was trained with, if it has them
+    from huggingface_hub import hf_hub_download
+    for filename in ("sentence_bert_config.json", "1_Pooling/config.json"):
+        try:
+            hf_hub_download(model_id, filename, local_dir=model_dir)
+        except Exception:
+            pass
+
+    if quantize:
+        if platform.machine().lower() in ("arm64", "aarch64"):
+            qconfig = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+        else:
+            qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+
+        logger.info("Quantizing ONNX model to int8")
+        ORTQuantizer.from_pretrained(model_dir).quantize(save_dir=model_dir, quantization_config=qconfig)
+
+
+class ONNXEmbeddings(Embeddings):
+    """LangChain embeddings backed by an ONNX Runtime inference session."""
+
+    def __init__(
+        self,
+        model_dir: Path,
+        model_id: Optional[str] = None,
+        model_file: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """Initialize the ONNX embeddings.
+
+        Args:
+            model_dir: Directory containing the exported ONNX model and tokenizer
+            model_id: Hugging Face model ID to export into model_dir if it has no model yet
+            model_file: ONNX file name inside model_dir (default: quantized if present)
+            num_threads: Intra-op threads for ONNX Runtime (default: Config.EMBED_NUM_THREADS,
+                or ONNX Runtime's own default when that is 0)
+            batch_size: Texts encoded per session call (default: Config.EMBED_BATCH_SIZE)
+        """
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_dir = Path(model_dir)
+        if model_id is not None and not any((model_dir / f).exists() for f in _MODEL_FILES):
+            export_model(model_id, model_dir)
+
+        if model_file is None:
+            model_file = next((f for f in _MODEL_FILES if (model_dir / f).exists()), _MODEL_FILES[-1])
+
+        model_path = model_dir / model_file
+        if not model_path.exists():
+            raise ValueError(f"ONNX model not found: {model_path}")
+
+        logger.info("Loading ONNX embedding model: %s", model_path)
+
+        options = ort.SessionOptions()
+        # 0 lets ONNX Runtime pick (one thread per physical core)
+        options.intra_op_num_threads = num_threads or Config.EMBED_NUM_THREADS
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(
+            str(model_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir), use_fast=True)
+        self.batch_size = batch_size or Config.EMBED_BATCH_SIZE
+        self.max_length = self._read_max_length(model_dir)
+
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        output_names = [o.name for o in self.session.get_outputs()]
+        # sentence-transformers exports include a pooled output; plain
+        # transformer exports only have token embeddings and are pooled here
+        self._pooled_output = "sentence_embedding" if "sentence_embedding" in output_names else None
+        self._token_output = output_names[0]
+        self.pooling = self._read_pooling_mode(model_dir) if self._pooled_output is None else None
+
+    def _read_max_length(self, model_dir: Path) -> int:
+        """Get the sequence length the model was trained with."""
+        config_path = model_dir / "sentence_bert_config.json"
+        if config_path.exists():
+            return json.loads(config_path.read_text())["max_seq_length"]
+        return min(self.tokenizer.model_max_length, 512)
+
+    def _read_pooling_mode(self, model_dir: Path) -> str:
+        """Get the pooling the model was trained with (mean if it has no pooling config)."""
+        config_path = model_dir / "1_Pooling" / "config.json"
+        if not config_path.exists():
+            return "mean"
+
+        enabled = [key for key, value in json.loads(config_path.read_text()).items()
+                   if key.startswith("pooling_mode_") and value]
+        if len(enabled) != 1 or enabled[0] not in _POOLING_MODES:
+            raise ValueError(f"Unsupported pooling in {config_path}: {', '.join(enabled) or 'none'}")
+        return _POOLING_MODES[enabled[0]]
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode a batch of texts into L2-normalized embeddings."""
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np",
+        )
+        feeds = {k: v.astype(np.int64) for k, v in encoded.items() if k in self._input_names}
+
+        if self._pooled_output is not None:
+            embeddings = self.session.run([self._pooled_output], feeds)[0]
+        else:
+            token_embeddings = self.session.run([self._token_output], feeds)[0]
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            if self.pooling == "cls":
+                embeddings = token_embeddings[:, 0]
+            elif self.pooling == "max":
+                embeddings = np.where(mask > 0, token_embeddings, -np.inf).max(axis=1)
+            else:
+                embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.clip(norms, 1e-12, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents.
+
+        Texts are sorted by length before batching so each batch pads to a
+        similar length, then results are returned in input order.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            for i, vector in zip(batch, self._encode([texts[i] for i in batch])):
+                vectors[i] = vector.tolist()
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        return self._encode([text])[0].tolist()
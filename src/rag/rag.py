@@ -1,19 +1,32 @@
 """RAG query pipeline for document question answering."""
-from typing import Optional, Dict, Any, List
+import hashlib
+from typing import Optional, Dict, Any, List, Tuple
 from operator import itemgetter
 
+import httpx
+
 from langchain_core.prompts import PromptTemplate
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough, RunnableParallel
+from langchain_core.runnables import RunnableLambda, RunnableParallel
 from langchain_ollama import OllamaLLM
 
 from src.config import Config
-from src.utils import get_logger
+from src.utils import get_logger, LRUCache, dumps_json
 from src.rag.vector_store import VectorStoreManager
 
 logger = get_logger(__name__)
 
+# Technical metadata excluded from formatted sources
+_EXCLUDED_METADATA = frozenset(("pk", "embedding"))
+
+# Maximum characters of source content included in results
+_SOURCE_PREVIEW_CHARS = 500
+
+# LLM clients shared per (model, server URL) so their HTTP connection pools,
+# and the keep-alive connections in them, outlive individual pipelines
+_LLM_CLIENTS: Dict[Tuple[str, str], OllamaLLM] = {}
+
 
 class RAGPipeline:
     """Retrieval-Augmented Generation pipeline using Ollama."""
@@ -47,6 +60,16 @@ class RAGPipeline:
         # Initialize retriever
         self.retriever = self.vector_store_manager.get_retriever(top_k=self.top_k)
 
+        if Config.RERANK_FAN_OUT > 1 and Config.NUMBA_WARMUP:
+            # numba is only imported when re-scoring is enabled
+            from src.rag import rerank
+            rerank.warmup()
+
+        # Caches keyed by normalized question, so repeated or re-cased questions
+        # skip the vector search and the LLM call
+        self._retrieval_cache = LRUCache(Config.QUERY_CACHE_SIZE)
+        self._answer_cache = LRUCache(Config.QUERY_CACHE_SIZE)
+
         # Initialize LLM
         self._init_llm()
 
@@ -55,45 +78,102 @@ class RAGPipeline:
 
     def _init_llm(self) -> None:
         """Initialize the Ollama language model."""
-        logger.info(f"Initializing Ollama LLM: {self.model_name}")
-        logger.info(f"Ollama server URL: {self.ollama_base_url}")
+        logger.info("Initializing Ollama LLM: %s", self.model_name)
+        logger.info("Ollama server URL: %s", self.ollama_base_url)
+
+        key = (self.model_name, self.ollama_base_url)
+        if key in _LLM_CLIENTS:
+            self.llm = _LLM_CLIENTS[key]
+            logger.info("Reusing Ollama LLM client: %s", self.model_name)
+            return
 
         try:
             self.llm = OllamaLLM(
                 model=self.model_name,
                 base_url=self.ollama_base_url,
                 temperature=0.7,
+                # Keep enough pooled connections alive for batch_query's concurrency
+                client_kwargs={
+                    "limits": httpx.Limits(
+                        max_connections=Config.MAX_CONCURRENCY,
+                        max_keepalive_connections=Config.MAX_CONCURRENCY,
+                    ),
+                },
             )
-            logger.info(f"Successfully initialized Ollama LLM: {self.model_name}")
+            _LLM_CLIENTS[key] = self.llm
+            logger.info("Successfully initialized Ollama LLM: %s", self.model_name)
         except Exception as e:
-            logger.error(f"Failed to initialize Ollama LLM: {str(e)}")
+            logger.error("Failed to initialize Ollama LLM: %s", e)
             logger.error("Make sure Ollama is running locally. Install it from: https://ollama.ai")
-            logger.error(f"Then run: ollama pull {self.model_name}")
+            logger.error("Then run: ollama pull %s", self.model_name)
             raise
 
     def _format_docs(self, docs: List[Document]) -> str:
         """Format documents for the prompt."""
         return "\n\n".join(doc.page_content for doc in docs)
 
+    @staticmethod
+    def _normalize_question(question: str) -> str:
+        """Normalize a question for cache lookups (case and whitespace)."""
+        return " ".join(question.lower().split())
+
+    def _retrieve(self, question: str) -> List[Document]:
+        """Retrieve context documents, reusing results for repeated questions."""
+        key = self._normalize_question(question)
+
+        # The cache holds its own copies, so callers editing the returned
+        # documents don't change what later askers get
+        cached = self._retrieval_cache.get(key)
+        if cached is not None:
+            return [doc.model_copy(deep=True) for doc in cached]
+
+        if Config.RERANK_FAN_OUT > 1:
+            docs = self.vector_store_manager.reranked_search(question, k=self.top_k)
+        else:
+            docs = self.retriever.invoke(question)
+        self._retrieval_cache.put(key, [doc.model_copy(deep=True) for doc in docs])
+
+        return docs
+
+    def _answer(self, inputs: Dict[str, Any]) -> str:
+        """Generate an answer, reusing it when the question and context repeat."""
+        context = self._format_docs(inputs["docs"])
+        key = (
+            self._normalize_question(inputs["input"]),
+            hashlib.blake2b(context.encode(), digest_size=16).digest(),
+        )
+
+        answer = self._answer_cache.get(key)
+        if answer is None:
+            answer = self.answer_chain.invoke({"context": context, "input": inputs["input"]})
+            self._answer_cache.put(key, answer)
+
+        return answer
+
     def _create_chain(self) -> None:
         """Create the RAG chain using LCEL."""
         logger.info("Creating RAG chain using LCEL")
 
         try:
-            # Create the RAG chain using LangChain Expression Language
+            # Generation step: prompt variables -> answer text
+            self.answer_chain = self.prompt | self.llm | StrOutputParser()
+
+            # Retrieve once and feed the same documents to both the prompt and
+            # the caller, so sources don't require a second vector search
             self.rag_chain = (
                 RunnableParallel({
-                    "context": itemgetter("input") | self.retriever | self._format_docs,
-                    "input": itemgetter("input")
+                    "docs": itemgetter("input") | RunnableLambda(self._retrieve),
+                    "input": itemgetter("input"),
+                })
+                | RunnableParallel({
+                    "answer": RunnableLambda(self._answer),
+                    "docs": itemgetter("docs"),
                 })
-                | self.prompt
-                | self.llm
-                | StrOutputParser()
             )
 
             logger.info("RAG chain created successfully")
         except Exception as e:
-            logger.error(f"Failed to create RAG chain: {str(e)}")
+            logger.error("Failed to create RAG chain: %s", e)
             raise
 
     def query(self, question: str, return_sources: bool = True) -> Dict[str, Any]:
@@ -106,30 +186,46 @@ class RAGPipeline:
         Returns:
             Dictionary containing answer and optional source documents
         """
-        logger.info(f"Processing query: '{question}'")
+        # Only a preview of the question is logged; it may be long or contain personal data
+        logger.debug("Processing query: %.64s", question, extra={"query_len": len(question)})
 
         try:
-            # Get the answer
-            answer = self.rag_chain.invoke({"input": question})
+            # Get the answer and the documents it was generated from
+            output = self.rag_chain.invoke({"input": question})
 
             result = {
                 "question": question,
-                "answer": answer,
+                "answer": output["answer"],
             }
 
             # Get source documents if requested
             if return_sources:
-                context_docs = self.retriever.invoke(question)
+                context_docs = output["docs"]
                 result["sources"] = self._format_sources(context_docs)
                 result["num_sources"] = len(context_docs)
 
-            logger.info(f"Query processed successfully. Answer length: {len(result['answer'])} chars")
+            logger.info(
+                "Query processed successfully. Answer length: %d chars", len(result["answer"]),
+                extra={"answer_len": len(result["answer"])},
+            )
             return result
 
         except Exception as e:
-            logger.error(f"Failed to process query: {str(e)}")
+            logger.error("Failed to process query: %s", e)
             raise
 
+    def query_json(self, question: str, return_sources: bool = True) -> bytes:
+        """Query the RAG system and return the result as JSON.
+
+        Args:
+            question: User's question
+            return_sources: Whether to include source documents
+
+        Returns:
+            UTF-8 encoded JSON of the query result
+        """
+        return dumps_json(self.query(question, return_sources=return_sources))
+
     def _format_sources(self, context_docs: List[Document]) -> List[Dict[str, Any]]:
         """Format source documents for output.
 
@@ -142,15 +238,19 @@ class RAGPipeline:
         sources = []
 
         for i, doc in enumerate(context_docs, 1):
-            source = {
+            content = doc.page_content
+            if len(content) > _SOURCE_PREVIEW_CHARS:
+                content = content[:_SOURCE_PREVIEW_CHARS]
+
+            metadata = doc.metadata
+            if not _EXCLUDED_METADATA.isdisjoint(metadata):
+                metadata = {k: v for k, v in metadata.items() if k not in _EXCLUDED_METADATA}
+
+            sources.append({
                 "number": i,
-                "content": doc.page_content[:500],  # Limit content length
-                "metadata": {
-                    k: v for k, v in doc.metadata.items()
-                    if k not in ["pk", "embedding"]  # Exclude technical metadata
-                }
-            }
-            sources.append(source)
+                "content": content,
+                "metadata": metadata,
+            })
 
         return sources
 
@@ -163,20 +263,34 @@ class RAGPipeline:
         Returns:
             List of results for each question
         """
-        logger.info(f"Processing batch of {len(questions)} questions")
+        logger.info("Processing batch of %d questions", len(questions))
+
+        # Run the chain for all questions concurrently so Milvus searches and
+        # Ollama generations overlap instead of running back to back
+        outputs = self.rag_chain.batch(
+            [{"input": question} for question in questions],
+            config={"max_concurrency": Config.MAX_CONCURRENCY},
+            return_exceptions=True,
+        )
 
         results = []
-        for question in questions:
-            try:
-                result = self.query(question)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to process question '{question}': {str(e)}")
+        for question, output in zip(questions, outputs):
+            if isinstance(output, Exception):
+                logger.error("Failed to process question '%.64s': %s", question, output)
                 results.append({
                     "question": question,
-                    "answer": f"Error: {str(e)}",
+                    "answer": f"Error: {str(output)}",
                     "error": True
                 })
+                continue
+
+            context_docs = output["docs"]
+            results.append({
+                "question": question,
+                "answer": output["answer"],
+                "sources": self._format_sources(context_docs),
+                "num_sources": len(context_docs),
+            })
 
         return results
 
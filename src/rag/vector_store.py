@@ -1,16 +1,47 @@
 """Vector store management for document embeddings."""
+import asyncio
+import logging
+import math
+import threading
+import time
+from functools import cached_property
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 from langchain_core.documents import Document
-from langchain_huggingface.embeddings import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain_milvus import Milvus
 from langchain_core.vectorstores import VectorStoreRetriever
 
 from src.config import Config
-from src.utils import get_logger
+from src.utils import get_logger, LRUCache
+from src.rag.embed_cache import EmbeddingCache, QueryEmbeddingCache
 
 logger = get_logger(__name__)
 
+# Embedding models shared by every VectorStoreManager in the process, keyed by
+# (backend, model ID, device, dtype); loading the weights dominates startup
+_EMBEDDER_POOL: Dict[Tuple[str, str, str, str], Embeddings] = {}
+# Held while a model is looked up and loaded, so concurrent first searches load it once
+_EMBEDDER_POOL_LOCK = threading.Lock()
+
+# Rows per insert request, keeping each request well under the gRPC message size limit
+_INSERT_BATCH = 10_000
+
+
+class _LazyEmbeddings(Embeddings):
+    """Hands Milvus an embedding function without loading the model up front."""
+
+    def __init__(self, manager: "VectorStoreManager"):
+        self._manager = manager
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._manager.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._manager.embeddings.embed_query(text)
+
 
 class VectorStoreManager:
     """Manages the vector store for document embeddings."""
@@ -32,15 +63,130 @@ class VectorStoreManager:
         self.milvus_uri = milvus_uri or Config.get_milvus_uri()
         self.embed_model_id = embed_model_id or Config.EMBED_MODEL_ID
 
-        logger.info(f"Initializing embeddings with model: {self.embed_model_id}")
-        self.embeddings = HuggingFaceEmbeddings(
+        # Passed to Milvus in place of the model, which loads on first embed
+        self._lazy_embeddings = _LazyEmbeddings(self)
+
+        # Recent similarity_search results keyed by (query, k); cleared when the collection changes
+        self._search_cache = LRUCache(Config.QUERY_CACHE_SIZE, ttl=Config.SEARCH_CACHE_TTL)
+
+        self.vectorstore: Optional[Milvus] = None
+
+        # Loaded collection handle and field names used by direct searches
+        self._collection = None
+        self._vector_field: Optional[str] = None
+        self._text_field: Optional[str] = None
+        self._result_fields: List[str] = []
+
+        # Bit-packed companion collection for two-stage search (BINARY_INDEX_ENABLED)
+        self._binary_index = None
+
+        # Index actually used by the collection; updated from Milvus once it exists
+        self.index_type = Config.MILVUS_INDEX_TYPE
+        self.metric_type = Config.MILVUS_METRIC_TYPE
+        self.index_nlist = Config.IVF_NLIST
+
+    @cached_property
+    def embeddings(self) -> Embeddings:
+        """Embedding model, loaded on first use and shared across managers."""
+        pool_key = (Config.EMBED_BACKEND, self.embed_model_id, self.embed_device, self.embed_dtype)
+        with _EMBEDDER_POOL_LOCK:
+            embeddings = _EMBEDDER_POOL.get(pool_key)
+            if embeddings is None:
+                logger.info(
+                    "Initializing %s embeddings with model: %s (%s, %s)",
+                    Config.EMBED_BACKEND, self.embed_model_id, self.embed_device, self.embed_dtype,
+                )
+                embeddings = self._create_embeddings()
+                _EMBEDDER_POOL[pool_key] = embeddings
+        return embeddings
+
+    @property
+    def embed_device(self) -> str:
+        """Device the embedding model runs on."""
+        return self._device_and_dtype[0]
+
+    @property
+    def embed_dtype(self) -> str:
+        """Precision the embedding model runs in."""
+        return self._device_and_dtype[1]
+
+    @cached_property
+    def _device_and_dtype(self) -> Tuple[str, str]:
+        return self._resolve_device()
+
+    @cached_property
+    def _cache_namespace(self) -> str:
+        # Vectors from different backends and precisions differ slightly, so keep their caches apart
+        namespace = self.embed_model_id
+        if Config.EMBED_BACKEND != "huggingface":
+            namespace += f"@{Config.EMBED_BACKEND}"
+        if self.embed_dtype != "float32":
+            namespace += f":{self.embed_dtype}"
+        return namespace
+
+    @cached_property
+    def embed_cache(self) -> Optional[EmbeddingCache]:
+        """Persistent cache of chunk embeddings, or None if caching is disabled."""
+        return EmbeddingCache(self._cache_namespace) if Config.CACHE_ENABLED else None
+
+    @cached_property
+    def query_cache(self) -> Optional[QueryEmbeddingCache]:
+        """Persistent cache of query embeddings, or None if caching is disabled."""
+        return QueryEmbeddingCache(self._cache_namespace) if Config.CACHE_ENABLED else None
+
+    def _resolve_device(self) -> Tuple[str, str]:
+        """Resolve the embedding device and dtype.
+
+        With "auto", the model runs on CUDA in float16 when a GPU is available
+        and on CPU in float32 otherwise. bfloat16 is opt-in on CPU because it
+        is only faster on CPUs with native BF16 support (AVX512-BF16/AMX).
+
+        Returns:
+            Tuple of (device, dtype name)
+        """
+        if Config.EMBED_BACKEND != "huggingface":
+            return "cpu", "float32"
+
+        device, dtype = Config.EMBED_DEVICE, Config.EMBED_DTYPE
+        if device == "auto":
+            import torch
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        if dtype == "auto":
+            dtype = "float16" if device.startswith("cuda") else "float32"
+
+        return device, dtype
+
+    def _create_embeddings(self) -> Embeddings:
+        """Create the embedding model for the configured backend.
+
+        Returns:
+            Embeddings instance
+        """
+        if Config.EMBED_BACKEND == "onnx":
+            from src.rag.onnx_embeddings import ONNXEmbeddings
+            return ONNXEmbeddings(Config.ONNX_MODEL_DIR, model_id=self.embed_model_id)
+
+        if Config.EMBED_BACKEND != "huggingface":
+            raise ValueError(f"Unsupported embedding backend: {Config.EMBED_BACKEND}")
+
+        if self.embed_device == "cpu" and Config.EMBED_NUM_THREADS > 0:
+            # Unset, torch keeps its own default of one thread per physical core
+            import torch
+            torch.set_num_threads(Config.EMBED_NUM_THREADS)
+
+        model_kwargs = {'device': self.embed_device}
+        if self.embed_dtype != "float32":
+            # Load weights directly in half precision; normalization below
+            # rescales away most of the numerical drift
+            model_kwargs['model_kwargs'] = {'torch_dtype': self.embed_dtype}
+
+        from langchain_huggingface.embeddings import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(
             model_name=self.embed_model_id,
-            model_kwargs={'device': 'cpu'},  # Change to 'cuda' if GPU available
+            model_kwargs=model_kwargs,
             encode_kwargs={'normalize_embeddings': True}
         )
 
-        self.vectorstore: Optional[Milvus] = None
-
     def create_vectorstore(
         self,
         documents: List[Document],
@@ -58,59 +204,346 @@ class VectorStoreManager:
         if not documents:
             raise ValueError("No documents provided to create vector store")
 
-        logger.info(f"Creating vector store with {len(documents)} documents")
-        logger.info(f"Collection: {self.collection_name}")
-        logger.info(f"Milvus URI: {self.milvus_uri}")
+        logger.info("Creating vector store with %d documents", len(documents))
+        self._search_cache.clear()
+        logger.info("Collection: %s", self.collection_name)
+        logger.info("Milvus URI: %s", self.milvus_uri)
 
         try:
-            self.vectorstore = Milvus.from_documents(
-                documents=documents,
-                embedding=self.embeddings,
+            self.index_type = Config.MILVUS_INDEX_TYPE
+            self.metric_type = Config.MILVUS_METRIC_TYPE
+            self.index_nlist = Config.IVF_NLIST
+
+            if self.index_type == "AUTO":
+                dim = len(self.embeddings.embed_query(documents[0].page_content))
+                index_params = self._choose_index_params(len(documents), dim)
+                self.index_type = index_params["index_type"]
+            else:
+                index_params = self._index_params()
+
+            self.vectorstore = Milvus(
+                embedding_function=self._lazy_embeddings,
                 collection_name=self.collection_name,
                 connection_args={"uri": self.milvus_uri},
-                index_params={"index_type": Config.MILVUS_INDEX_TYPE},
+                index_params=index_params,
+                search_params=self._search_params(),
                 drop_old=drop_old,
+                auto_id=True,
             )
+            if drop_old:
+                # Codes left from the old collection would point at stale primary keys
+                self._drop_binary_index()
+
+            self._add_batched(documents)
+            self._sync_index_info()
+            self._warm_collection()
 
             logger.info("Vector store created successfully")
             return self.vectorstore
 
         except Exception as e:
-            logger.error(f"Failed to create vector store: {str(e)}")
+            logger.error("Failed to create vector store: %s", e)
             raise
 
+    def _index_params(self) -> Dict[str, Any]:
+        """Build index parameters for a new collection from the configuration."""
+        params = {}
+        if self.index_type in ("HNSW", "HNSW_SQ"):
+            params = {"M": Config.HNSW_M, "efConstruction": Config.HNSW_EF_CONSTRUCTION}
+        if self.index_type == "HNSW_SQ":
+            # Graph vectors are stored quantized (int8 for SQ8), cutting index
+            # memory and bytes read per distance computation
+            params["sq_type"] = Config.MILVUS_SQ_TYPE
+        if self.index_type in ("IVF_FLAT", "IVF_SQ8"):
+            # IVF_SQ8 stores each dimension as int8: 4x less memory than FLAT
+            params = {"nlist": Config.IVF_NLIST}
+
+        return {"index_type": self.index_type, "metric_type": self.metric_type, "params": params}
+
+    def _choose_index_params(self, num_docs: int, dim: int) -> Dict[str, Any]:
+        """Choose index parameters for a corpus size (MILVUS_INDEX_TYPE=AUTO).
+
+        - Under 100k vectors: HNSW, the fastest index while everything fits in memory.
+        - Under 1M vectors: IVF_SQ8 with nlist = sqrt(N), storing int8 vectors (4x smaller).
+        - 1M vectors and up: IVF_PQ with nlist = 4 * sqrt(N), m = dim / 8 and 8-bit
+          codes, storing dim / 8 bytes per vector instead of dim * 4.
+
+        Args:
+            num_docs: Number of vectors in the collection
+            dim: Vector dimension
+
+        Returns:
+            Index parameters
+        """
+        nlist = max(int(math.sqrt(num_docs)), 1)
+        if num_docs < 100_000:
+            index_type = "HNSW"
+            params = {"M": Config.HNSW_M, "efConstruction": Config.HNSW_EF_CONSTRUCTION}
+            reason = "graph search is fastest while the index fits in memory"
+        elif num_docs < 1_000_000 or dim % 8:
+            index_type = "IVF_SQ8"
+            params = {"nlist": min(nlist, 65536)}
+            reason = "int8 scalar quantization cuts vector memory 4x"
+        else:
+            index_type = "IVF_PQ"
+            params = {"nlist": min(4 * nlist, 65536), "m": dim // 8, "nbits": 8}
+            reason = f"product quantization stores {dim // 8} bytes per vector instead of {dim * 4}"
+
+        logger.info("Chose %s index for %d vectors of dim %d: %s", index_type, num_docs, dim, reason)
+        return {"index_type": index_type, "metric_type": self.metric_type, "params": params}
+
+    def tune_index(self) -> None:
+        """Rebuild the index for the final corpus size when MILVUS_INDEX_TYPE is AUTO.
+
+        A streamed build creates the collection from its first batch of chunks,
+        before the final size is known, so the choice is revisited once all
+        chunks are inserted.
+        """
+        if Config.MILVUS_INDEX_TYPE != "AUTO" or self._collection is None:
+            return
+
+        col = self._collection
+        col.flush()
+        index_params = self._choose_index_params(col.num_entities, self._vector_dim())
+
+        # HNSW parameters do not depend on the corpus size; IVF nlist does
+        if index_params["index_type"] == self.index_type == "HNSW":
+            return
+
+        logger.info("Rebuilding %s index as %s", self.index_type, index_params["index_type"])
+        col.release()
+        col.drop_index()
+        col.create_index(self._vector_field, index_params)
+        self._sync_index_info()
+        col.load()
+
+    def _search_params(self, k: Optional[int] = None) -> Dict[str, Any]:
+        """Build search parameters matching the collection's index.
+
+        Recall depends on how much of the index a search visits, which has to
+        grow with the number of results requested:
+
+        - HNSW keeps ``ef`` candidates while walking the graph and can return
+          at most ``ef`` hits, so ``ef`` is at least 4x k.
+        - IVF scans ``nprobe`` of its ``nlist`` clusters; one extra cluster per
+          four results keeps the nearest clusters covered as k grows.
+
+        Args:
+            k: Number of results the search returns (default: tuned for Config.TOP_K)
+
+        Returns:
+            Milvus search parameters
+        """
+        k = k or Config.TOP_K
+        params = {}
+        if self.index_type in ("HNSW", "HNSW_SQ"):
+            params = {"ef": max(Config.HNSW_EF, 4 * k)}
+        if self.index_type in ("IVF_FLAT", "IVF_SQ8", "IVF_PQ"):
+            params = {"nprobe": min(max(Config.IVF_NPROBE, k // 4 + 16), self.index_nlist)}
+
+        return {"metric_type": self.metric_type, "params": params}
+
+    def _sync_index_info(self) -> None:
+        """Adopt the index of an existing collection and tune search params for it.
+
+        Collections built before an index change keep their original index and
+        metric, so search parameters are derived from what Milvus reports
+        rather than from the current configuration.
+        """
+        col = self.vectorstore.col
+        if col is not None and col.indexes:
+            index = col.indexes[0].params
+            self.index_type = index.get("index_type", self.index_type)
+            self.metric_type = index.get("metric_type", self.metric_type)
+            build_params = index.get("params", index)
+            self.index_nlist = int(build_params.get("nlist", self.index_nlist))
+
+        self.vectorstore.search_params = self._search_params()
+        logger.info(
+            "Using %s index (%s), search params: %s",
+            self.index_type, self.metric_type, self.vectorstore.search_params,
+        )
+
+    def _warm_collection(self) -> None:
+        """Pin the collection in memory and cache the handles used by direct searches.
+
+        Searches then go straight to ``Collection.search`` instead of through
+        the langchain-milvus per-call setup.
+        """
+        collection = self.vectorstore.col
+        if collection is None:
+            raise ValueError(f"Collection does not exist: {self.collection_name}")
+
+        # load() blocks until every segment is in memory, so the first search
+        # does not pay for it
+        start = time.perf_counter()
+        try:
+            collection.load(replica_number=1)
+        except Exception as e:
+            logger.error("Failed to load collection %s into memory: %s", self.collection_name, e)
+            raise
+        logger.info("Loaded collection %s into memory in %.2fs", self.collection_name, time.perf_counter() - start)
+
+        self._collection = collection
+        self._vector_field = self.vectorstore._vector_field
+        self._text_field = self.vectorstore._text_field
+        self._result_fields = [f for f in self.vectorstore.fields if f != self._vector_field]
+
+    def _add_batched(self, documents: List[Document]) -> None:
+        """Embed and insert documents.
+
+        Chunks are encoded in mini-batches with a single ``embed_documents``
+        call each, so the model runs one forward pass per batch instead of one
+        per chunk. When the embedding cache is enabled only uncached chunks are
+        encoded. Rows are then inserted column-wise (see ``_insert_columns``).
+
+        Args:
+            documents: List of documents to embed and insert
+        """
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+        batch_size = Config.EMBED_BATCH_SIZE
+
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            if self.embed_cache is not None:
+                vectors.extend(self.embed_cache.embed_documents(batch, self.embeddings.embed_documents))
+            else:
+                vectors.extend(self.embeddings.embed_documents(batch))
+            logger.info("Embedded %d/%d documents", min(start + batch_size, len(texts)), len(texts))
+
+        pks = []
+        inserted = 0
+        if self.vectorstore.col is None:
+            # langchain-milvus derives the collection schema from the first insert
+            inserted = min(batch_size, len(texts))
+            pks.extend(self.vectorstore.add_embeddings(
+                texts=texts[:inserted],
+                embeddings=vectors[:inserted],
+                metadatas=metadatas[:inserted],
+            ))
+
+        if inserted < len(texts):
+            if self.vectorstore.enable_dynamic_field or self.vectorstore._metadata_field:
+                # Metadata stored in a dynamic or JSON field needs langchain-milvus's row layout
+                pks.extend(self.vectorstore.add_embeddings(
+                    texts=texts[inserted:],
+                    embeddings=vectors[inserted:],
+                    metadatas=metadatas[inserted:],
+                    batch_size=_INSERT_BATCH,
+                ))
+            else:
+                pks.extend(self._insert_columns(texts[inserted:], vectors[inserted:], metadatas[inserted:]))
+
+        if Config.BINARY_INDEX_ENABLED:
+            self._get_binary_index(len(vectors[0])).insert(pks, vectors)
+
+        logger.info("Indexed %d documents", len(texts))
+
+    def _insert_columns(
+        self,
+        texts: List[str],
+        vectors: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+    ) -> List[Any]:
+        """Insert rows as one list per schema field.
+
+        langchain-milvus builds a dict per row before inserting; passing
+        columns straight to ``Collection.insert`` skips that per-row work.
+
+        Args:
+            texts: Chunk texts
+            vectors: Embedding vectors, one per text
+            metadatas: Metadata dicts, one per text
+
+        Returns:
+            Primary keys of the inserted rows
+        """
+        col = self.vectorstore.col
+        text_field = self.vectorstore._text_field
+        vector_field = self.vectorstore._vector_field
+
+        columns = []
+        for field in col.schema.fields:
+            if field.is_primary and field.auto_id:
+                continue
+            if field.name == text_field:
+                columns.append(texts)
+            elif field.name == vector_field:
+                columns.append(vectors)
+            else:
+                columns.append([metadata.get(field.name) for metadata in metadatas])
+
+        pks = []
+        for start in range(0, len(texts), _INSERT_BATCH):
+            result = col.insert([column[start:start + _INSERT_BATCH] for column in columns])
+            pks.extend(result.primary_keys)
+        return pks
+
+    @property
+    def _binary_collection_name(self) -> str:
+        return f"{self.collection_name}_binary"
+
+    def _vector_dim(self) -> int:
+        """Get the embedding dimension from the collection schema."""
+        return next(f.params["dim"] for f in self._collection.schema.fields if f.name == self._vector_field)
+
+    def _drop_binary_index(self) -> None:
+        """Drop the binary companion collection, whether or not it is enabled."""
+        from src.rag.binary_index import BinaryIndex
+        BinaryIndex.drop(self._binary_collection_name, using=self.vectorstore.alias)
+        self._binary_index = None
+
+    def _get_binary_index(self, dim: int):
+        """Open and load the binary companion collection, creating it on first use."""
+        if self._binary_index is None:
+            from src.rag.binary_index import BinaryIndex
+            self._binary_index = BinaryIndex(self._binary_collection_name, dim, using=self.vectorstore.alias)
+        return self._binary_index
+
     def load_vectorstore(self) -> Milvus:
         """Load an existing vector store.
 
         Returns:
             Milvus vector store instance
         """
-        logger.info(f"Loading existing vector store: {self.collection_name}")
+        logger.info("Loading existing vector store: %s", self.collection_name)
+        self._search_cache.clear()
 
         try:
             self.vectorstore = Milvus(
-                embedding_function=self.embeddings,
+                embedding_function=self._lazy_embeddings,
                 collection_name=self.collection_name,
                 connection_args={"uri": self.milvus_uri},
             )
+            self._sync_index_info()
+            self._warm_collection()
+
+            if Config.BINARY_INDEX_ENABLED:
+                binary_index = self._get_binary_index(self._vector_dim())
+                if binary_index.col.num_entities == 0:
+                    logger.warning("Binary index is empty; rebuild the index with --rebuild to populate it")
 
             logger.info("Vector store loaded successfully")
             return self.vectorstore
 
         except Exception as e:
-            logger.error(f"Failed to load vector store: {str(e)}")
+            logger.error("Failed to load vector store: %s", e)
             raise
 
     def get_retriever(
         self,
         top_k: Optional[int] = None,
-        search_type: str = "similarity"
+        search_type: str = "similarity",
+        search_params: Optional[Dict[str, Any]] = None,
     ) -> VectorStoreRetriever:
         """Get a retriever from the vector store.
 
         Args:
             top_k: Number of documents to retrieve
             search_type: Type of search (similarity, mmr, etc.)
+            search_params: Milvus search parameters (default: tuned for the index)
 
         Returns:
             Vector store retriever
@@ -119,12 +552,16 @@ class VectorStoreManager:
             raise ValueError("Vector store not initialized. Call create_vectorstore or load_vectorstore first.")
 
         k = top_k or Config.TOP_K
+        search_params = search_params or self._search_params(k)
 
-        logger.info(f"Creating retriever with top_k={k}, search_type={search_type}")
+        logger.info(
+            "Creating retriever with top_k=%d, search_type=%s, search params: %s",
+            k, search_type, search_params,
+        )
 
         retriever = self.vectorstore.as_retriever(
             search_type=search_type,
-            search_kwargs={"k": k}
+            search_kwargs={"k": k, "param": search_params}
         )
 
         return retriever
@@ -132,29 +569,245 @@ class VectorStoreManager:
     def similarity_search(
         self,
         query: str,
-        k: Optional[int] = None
+        k: Optional[int] = None,
+        search_params: Optional[Dict[str, Any]] = None,
     ) -> List[Document]:
         """Perform similarity search on the vector store.
 
         Args:
             query: Search query
             k: Number of results to return
+            search_params: Milvus search parameters (default: tuned for the index)
 
         Returns:
             List of similar documents
         """
-        if self.vectorstore is None:
-            raise ValueError("Vector store not initialized")
+        # Hot path: the check is compiled out under python -O
+        assert self._collection is not None, "Vector store not initialized"
 
         k = k or Config.TOP_K
 
-        logger.info(f"Performing similarity search for: '{query}' (k={k})")
+        # Custom search params change the results, so only default searches are cached
+        cache_key = (query, k) if search_params is None else None
+        if cache_key is not None:
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(
+                    "Similarity search cache hit (k=%d): %.64s", k, query,
+                    extra={"query_len": len(query), "k": k, "cache_hit": True},
+                )
+                # Copies, so callers editing a result's metadata don't change the cache
+                return [doc.model_copy(deep=True) for doc in cached]
+
+        # Only a preview of the query is logged; it may be long or contain personal data
+        logger.debug(
+            "Performing similarity search (k=%d): %.64s", k, query,
+            extra={"query_len": len(query), "k": k, "cache_hit": False},
+        )
 
-        results = self.vectorstore.similarity_search(query, k=k)
-        logger.info(f"Found {len(results)} similar documents")
+        vectors = self._normalize([self._embed_query(query)])
+        hits = self._search_raw(vectors.tolist(), k, search_params=search_params)[0]
+        results = [self._hit_to_document(hit) for hit in hits]
+        logger.debug("Found %d similar documents", len(results), extra={"results": len(results)})
 
+        if cache_key is not None:
+            self._search_cache.put(cache_key, [doc.model_copy(deep=True) for doc in results])
         return results
 
+    async def asimilarity_search(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[Document]:
+        """Perform similarity search without blocking the event loop.
+
+        The embedding forward pass and the Milvus RPC both release the GIL,
+        so several searches gathered with ``asyncio.gather`` overlap.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+            search_params: Milvus search parameters (default: tuned for the index)
+
+        Returns:
+            List of similar documents
+        """
+        return await asyncio.to_thread(self.similarity_search, query, k, search_params)
+
+    def similarity_search_batch(
+        self,
+        queries: List[str],
+        k: Optional[int] = None
+    ) -> List[List[Document]]:
+        """Perform similarity search for several queries at once.
+
+        All queries are embedded with one batched ``embed_documents`` call and
+        searched with a single multi-vector Milvus request. Both embedding
+        backends already length-sort texts within a batch to minimize padding.
+
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+
+        Returns:
+            List of similar documents for each query, in input order
+        """
+        assert self._collection is not None, "Vector store not initialized"
+
+        if not queries:
+            return []
+
+        k = k or Config.TOP_K
+
+        logger.debug(
+            "Performing batch similarity search for %d queries (k=%d)", len(queries), k,
+            extra={"queries": len(queries), "k": k},
+        )
+
+        if self.query_cache is not None:
+            vectors = self.query_cache.embed_documents(list(queries), self.embeddings.embed_documents)
+        else:
+            vectors = self.embeddings.embed_documents(list(queries))
+        results = [
+            [self._hit_to_document(hit) for hit in hits]
+            for hits in self._search_raw(self._normalize(vectors).tolist(), k)
+        ]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Found %d similar documents", sum(len(docs) for docs in results))
+        return results
+
+    def reranked_search(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        fan_out: Optional[int] = None,
+    ) -> List[Document]:
+        """Fetch k * fan_out candidates and re-score them with exact cosine similarity.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+            fan_out: Candidate multiplier (default: Config.RERANK_FAN_OUT)
+
+        Returns:
+            List of the k most similar documents
+        """
+        assert self._collection is not None, "Vector store not initialized"
+
+        k = k or Config.TOP_K
+        fan_out = fan_out or Config.RERANK_FAN_OUT
+
+        query_vector = self._normalize([self._embed_query(query)])[0]
+        hits = list(self._search_raw([query_vector.tolist()], k * fan_out, include_vector=True)[0])
+        if not hits:
+            return []
+
+        from src.rag.rerank import cosine_topk
+        candidates = np.asarray([hit.entity.get(self._vector_field) for hit in hits], dtype=np.float32)
+        top = cosine_topk(query_vector, candidates, k)
+
+        return [self._hit_to_document(hits[i]) for i in top]
+
+    def similarity_search_two_stage(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        candidates: Optional[int] = None,
+    ) -> List[Document]:
+        """Find candidates by Hamming distance over binary codes, then re-score them exactly.
+
+        Requires BINARY_INDEX_ENABLED when the index was built.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+            candidates: Number of coarse candidates to re-score (default: 10 * k)
+
+        Returns:
+            List of the k most similar documents
+        """
+        assert self._collection is not None, "Vector store not initialized"
+        if self._binary_index is None:
+            raise ValueError("Binary index not available; set BINARY_INDEX_ENABLED=true and rebuild the index")
+
+        k = k or Config.TOP_K
+        candidates = candidates or 10 * k
+
+        query_vector = self._normalize([self._embed_query(query)])[0]
+        pks = self._binary_index.search(query_vector, candidates)
+        if not pks:
+            return []
+
+        rows = self._collection.query(
+            expr=f"{self.vectorstore._primary_field} in {pks}",
+            output_fields=self._result_fields + [self._vector_field],
+        )
+        from src.rag.rerank import cosine_topk
+        matrix = np.asarray([row[self._vector_field] for row in rows], dtype=np.float32)
+        top = cosine_topk(query_vector, matrix, k)
+
+        return [self._entity_to_document(rows[i]) for i in top]
+
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a search query, reusing a cached vector when available."""
+        if self.query_cache is not None:
+            return self.query_cache.embed_query(query, self.embeddings.embed_query)
+        return self.embeddings.embed_query(query)
+
+    @staticmethod
+    def _normalize(vectors: List[List[float]]) -> np.ndarray:
+        """L2-normalize query vectors as a float32 matrix.
+
+        Stored vectors are unit length, so with the IP metric a unit query
+        makes scores exact cosine similarities even after a half-precision
+        model or the float16 query cache has nudged its norm.
+        """
+        matrix = np.asarray(vectors, dtype=np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+        return matrix
+
+    def _search_raw(
+        self,
+        vectors: List[List[float]],
+        limit: int,
+        include_vector: bool = False,
+        search_params: Optional[Dict[str, Any]] = None,
+    ):
+        """Run a search directly against the loaded Milvus collection.
+
+        Args:
+            vectors: Query vectors
+            limit: Number of hits per query vector
+            include_vector: Whether hits should carry their stored vectors
+            search_params: Milvus search parameters (default: tuned for the index)
+
+        Returns:
+            pymilvus search result, one list of hits per query vector
+        """
+        output_fields = self._result_fields
+        if include_vector:
+            output_fields = output_fields + [self._vector_field]
+
+        return self._collection.search(
+            data=vectors,
+            anns_field=self._vector_field,
+            param=search_params or self._search_params(limit),
+            limit=limit,
+            output_fields=output_fields,
+        )
+
+    def _hit_to_document(self, hit) -> Document:
+        """Convert a pymilvus search hit to a Document, as langchain-milvus does."""
+        return self._entity_to_document(hit.entity)
+
+    def _entity_to_document(self, entity) -> Document:
+        """Convert a search hit entity or query row to a Document."""
+        metadata = {field: entity.get(field) for field in self._result_fields}
+        text = metadata.pop(self._text_field)
+        return Document(page_content=text, metadata=metadata)
+
     def add_documents(self, documents: List[Document]) -> None:
         """Add new documents to the existing vector store.
 
@@ -168,14 +821,17 @@ class VectorStoreManager:
             logger.warning("No documents provided to add")
             return
 
-        logger.info(f"Adding {len(documents)} documents to vector store")
+        logger.info("Adding %d documents to vector store", len(documents))
 
         try:
-            self.vectorstore.add_documents(documents)
+            self._add_batched(documents)
             logger.info("Documents added successfully")
         except Exception as e:
-            logger.error(f"Failed to add documents: {str(e)}")
+            logger.error("Failed to add documents: %s", e)
             raise
+        finally:
+            # Cached results may be missing the new documents
+            self._search_cache.clear()
 
     def delete_collection(self) -> None:
         """Delete the vector store collection."""
@@ -183,12 +839,17 @@ class VectorStoreManager:
             logger.warning("No vector store to delete")
             return
 
-        logger.info(f"Deleting collection: {self.collection_name}")
+        logger.info("Deleting collection: %s", self.collection_name)
 
         try:
+            # Free the loaded segments before dropping
+            self.vectorstore.col.release()
             self.vectorstore.col.drop()
+            self._drop_binary_index()
             self.vectorstore = None
+            self._collection = None
+            self._search_cache.clear()
             logger.info("Collection deleted successfully")
         except Exception as e:
-            logger.error(f"Failed to delete collection: {str(e)}")
+            logger.error("Failed to delete collection: %s", e)
             raise
@@ -1,4 +1,6 @@
 """Utility modules for the RAG system."""
-from src.utils.logger import get_logger
+from src.utils.logger import flush_logs, get_logger
+from src.utils.cache import LRUCache
+from src.utils.serialization import dumps_json
 
-__all__ = ["get_logger"]
+__all__ = ["get_logger", "flush_logs", "LRUCache", "dumps_json"]
@@ -1,68 +1,186 @@
-"""Logging configuration for the RAG system."""
+"""Logging configuration for the RAG system.
+
+Loggers only enqueue records; background listeners format and write them (one
+for the console, one per log file), so log I/O never blocks the calling thread.
+"""
+import atexit
+import copy
 import logging
+import queue
 import sys
+import threading
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
 from src.config import Config
+from src.utils.serialization import dumps_json
+
+_LEVEL = getattr(logging, Config.LOG_LEVEL)
+
+# Log files rotate at 10 MB, keeping 5 old files
+_LOG_FILE_MAX_BYTES = 10_000_000
+_LOG_FILE_BACKUPS = 5
+
+# Queues of the running listeners, for flush_logs()
+_QUEUES: list = []
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "name": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return dumps_json(entry).decode()
+
 
+class _ConsoleHandler(logging.StreamHandler):
+    """StreamHandler for the stream named by Config.LOG_STREAM, looked up per record.
 
-class Logger:
-    """Custom logger for the RAG system."""
+    Resolving the stream on use lets ``query --json`` move logging to stderr
+    after the listener has started, and follows redirections of sys.stdout.
+    """
+
+    @property
+    def stream(self):
+        return sys.stderr if Config.LOG_STREAM == "stderr" else sys.stdout
 
-    _loggers = {}
+    @stream.setter
+    def stream(self, value) -> None:
+        pass
 
-    @classmethod
-    def get_logger(cls, name: str, log_file: Optional[Path] = None) -> logging.Logger:
-        """Get or create a logger with the specified name.
 
-        Args:
-            name: Logger name
-            log_file: Optional file path for logging
+class _QueueHandler(QueueHandler):
+    """QueueHandler that leaves exception formatting to the listener's formatter.
 
-        Returns:
-            Configured logger instance
-        """
-        if name in cls._loggers:
-            return cls._loggers[name]
+    The stock ``prepare`` renders the traceback into ``msg`` and clears
+    ``exc_info`` so records can be pickled; our queues never leave the process,
+    so the record keeps ``exc_info`` and JsonFormatter can emit it as a field.
+    """
 
-        logger = logging.getLogger(name)
-        logger.setLevel(getattr(logging, Config.LOG_LEVEL))
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Merge args now, while they still hold the values at the call site
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
-        # Remove existing handlers
-        logger.handlers.clear()
 
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, Config.LOG_LEVEL))
+class _QueueListener(QueueListener):
+    """QueueListener that also signals flush markers put on its queue."""
 
-        # Formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+    def handle(self, record) -> None:
+        if isinstance(record, threading.Event):
+            record.set()
+            return
+        super().handle(record)
 
-        # File handler (optional)
-        if log_file:
-            log_file.parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setLevel(getattr(logging, Config.LOG_LEVEL))
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
 
-        cls._loggers[name] = logger
-        return logger
+def _create_formatter() -> logging.Formatter:
+    """Create the formatter selected by Config.LOG_FORMAT."""
+    if Config.LOG_FORMAT == "json":
+        return JsonFormatter(datefmt='%Y-%m-%dT%H:%M:%S')
+    return logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
 
 
-def get_logger(name: str) -> logging.Logger:
-    """Convenience function to get a logger.
+def _start_listener(handler: logging.Handler) -> queue.SimpleQueue:
+    """Start a background listener that writes queued records to a handler.
+
+    Args:
+        handler: Handler that does the actual I/O
+
+    Returns:
+        Queue to attach QueueHandlers to
+    """
+    handler.setLevel(_LEVEL)
+    handler.setFormatter(_create_formatter())
+
+    log_queue = queue.SimpleQueue()
+    listener = _QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    # Flush records still queued when the process exits
+    atexit.register(listener.stop)
+    _QUEUES.append(log_queue)
+    return log_queue
+
+
+def flush_logs(timeout: float = 1.0) -> None:
+    """Wait until records logged so far have been written.
+
+    Call before printing to or reading from the console, so queued log lines
+    do not appear in the middle of interactive output.
+
+    Args:
+        timeout: Maximum seconds to wait per listener
+    """
+    for log_queue in list(_QUEUES):
+        written = threading.Event()
+        log_queue.put(written)
+        written.wait(timeout)
+
+
+@lru_cache(maxsize=None)
+def _get_queue() -> queue.SimpleQueue:
+    """Get the shared console log queue, starting its listener on first use."""
+    return _start_listener(_ConsoleHandler())
+
+
+@lru_cache(maxsize=None)
+def _get_file_queue(log_file: Path) -> queue.SimpleQueue:
+    """Get the log queue for a file, starting its listener on first use."""
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    return _start_listener(RotatingFileHandler(
+        log_file,
+        maxBytes=_LOG_FILE_MAX_BYTES,
+        backupCount=_LOG_FILE_BACKUPS,
+        encoding="utf-8",
+    ))
+
+
+@lru_cache(maxsize=None)
+def _configure(name: str) -> logging.Logger:
+    """Set the level and console handler of a logger, once per name."""
+    logger = logging.getLogger(name)
+    logger.setLevel(_LEVEL)
+
+    # Console output goes through the shared queue
+    logger.addHandler(_QueueHandler(_get_queue()))
+    return logger
+
+
+def get_logger(name: str, log_file: Optional[Path] = None) -> logging.Logger:
+    """Get or create a logger with the specified name.
 
     Args:
         name: Logger name
+        log_file: Optional file path for logging
 
     Returns:
         Configured logger instance
     """
-    return Logger.get_logger(name)
+    logger = _configure(name)
+
+    # File output (optional), written and rotated by the file's own listener
+    if log_file:
+        file_queue = _get_file_queue(Path(log_file))
+        if not any(getattr(h, "queue", None) is file_queue for h in logger.handlers):
+            logger.addHandler(_QueueHandler(file_queue))
+
+    return logger
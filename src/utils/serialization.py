@@ -0,0 +1,26 @@
+"""JSON serialization helpers for the RAG system."""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes.
+
+    Uses orjson when installed (the ``orjson`` extra), which serializes
+    directly to bytes and is several times faster than the standard library.
+    Values that are not JSON-native are converted with ``str``.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str, ensure_ascii=False).encode()
@@ -0,0 +1,100 @@
+"""Tests for the in-memory LRU cache."""
+from src.utils import cache as cache_module
+from src.utils.cache import LRUCache
+
+
+def test_get_returns_stored_value():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_put_existing_key_refreshes_recency():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_zero_maxsize_disables_caching():
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_clear():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+class FakeClock:
+    """Stands in for time.monotonic so expiry can be tested without sleeping."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = LRUCache(maxsize=2, ttl=10)
+    cache.put("a", 1)
+
+    clock.now += 9.9
+    assert cache.get("a") == 1
+
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_put_restarts_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = LRUCache(maxsize=2, ttl=10)
+    cache.put("a", 1)
+
+    clock.now += 8
+    cache.put("a", 2)
+    clock.now += 8
+
+    assert cache.get("a") == 2
+
+
+def test_no_ttl_never_expires(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+
+    clock.now += 1e9
+
+    assert cache.get("a") == 1
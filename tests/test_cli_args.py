@@ -0,0 +1,73 @@
+"""Tests for the command-line argument fast path in main.py."""
+from pathlib import Path
+
+import pytest
+
+from main import _build_parser, _parse_args
+
+
+@pytest.mark.parametrize("argv", [
+    ["build", "-d", "docs"],
+    ["query", "-q", "What is covered?"],
+    ["query", "--question", "What is covered?", "--no-sources", "--rebuild"],
+    ["-q", "What is covered?", "query", "--json"],
+    ["interactive"],
+])
+def test_fast_path_matches_argparse(argv):
+    """The fast path produces the same values argparse would."""
+    assert vars(_parse_args(argv)) == vars(_build_parser().parse_args(argv))
+
+
+def test_question_value():
+    args = _parse_args(["query", "-q", "What is covered?"])
+
+    assert args.command == "query"
+    assert args.question == "What is covered?"
+    assert args.data_dir is None
+    assert not args.json
+
+
+def test_data_dir_is_path():
+    args = _parse_args(["build", "--data-dir", "docs"])
+
+    assert args.data_dir == Path("docs")
+
+
+def test_json_flag():
+    args = _parse_args(["query", "-q", "hello", "--json"])
+
+    assert args.json
+    assert not args.no_sources
+
+
+def test_equals_form_falls_back_to_argparse():
+    args = _parse_args(["query", "--question=hello", "--data-dir=docs"])
+
+    assert args.question == "hello"
+    assert args.data_dir == Path("docs")
+
+
+def test_repeated_command_is_rejected():
+    with pytest.raises(SystemExit) as exc:
+        _parse_args(["query", "query", "-q", "hello"])
+
+    assert exc.value.code == 2
+
+
+@pytest.mark.parametrize("argv", [
+    ["query", "-q"],
+    ["query", "-q", "--json"],
+    ["build", "--data-dir"],
+])
+def test_missing_value_is_rejected(argv):
+    with pytest.raises(SystemExit) as exc:
+        _parse_args(argv)
+
+    assert exc.value.code == 2
+
+
+def test_missing_command_is_rejected():
+    with pytest.raises(SystemExit) as exc:
+        _parse_args(["-q", "hello"])
+
+    assert exc.value.code == 2
@@ -0,0 +1,85 @@
+"""Tests for the persistent embedding and parse caches."""
+import os
+
+from langchain_core.documents import Document
+
+from src.rag.embed_cache import EmbeddingCache, ParseCache
+
+
+class CountingEmbedder:
+    """Fake batch embedding function that records the texts it was given."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_embedding_cache_only_embeds_misses(tmp_path):
+    cache = EmbeddingCache("model-a", path=tmp_path / "cache.db")
+    embed = CountingEmbedder()
+
+    first = cache.embed_documents(["alpha", "be"], embed)
+    second = cache.embed_documents(["be", "gamma", "alpha"], embed)
+
+    assert embed.calls == [["alpha", "be"], ["gamma"]]
+    assert first == [[5.0, 1.0], [2.0, 1.0]]
+    assert second == [[2.0, 1.0], [5.0, 1.0], [5.0, 1.0]]
+
+
+def test_embedding_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.db"
+    EmbeddingCache("model-a", path=path).put_many(["alpha"], [[1.0, 2.0]])
+
+    assert EmbeddingCache("model-a", path=path).get_many(["alpha", "beta"]) == [[1.0, 2.0], None]
+
+
+def test_embedding_cache_is_namespaced_by_model(tmp_path):
+    path = tmp_path / "cache.db"
+    EmbeddingCache("model-a", path=path).put_many(["alpha"], [[1.0, 2.0]])
+
+    assert EmbeddingCache("model-b", path=path).get_many(["alpha"]) == [None]
+
+
+def _write(path, text):
+    path.write_text(text)
+    return path
+
+
+def test_parse_cache_hit(tmp_path):
+    doc_path = _write(tmp_path / "doc.txt", "hello")
+    cache = ParseCache("settings-1", path=tmp_path / "cache.db")
+    docs = [Document(page_content="hello", metadata={"source_file": "doc.txt"})]
+
+    assert cache.get(doc_path) is None
+    assert not cache.is_fresh(doc_path)
+
+    cache.put(doc_path, docs)
+
+    assert cache.is_fresh(doc_path)
+    assert cache.get(doc_path) == docs
+
+
+def test_parse_cache_invalidated_by_file_change(tmp_path):
+    doc_path = _write(tmp_path / "doc.txt", "hello")
+    cache = ParseCache("settings-1", path=tmp_path / "cache.db")
+    cache.put(doc_path, [Document(page_content="hello")])
+
+    _write(doc_path, "hello, world")
+    stat = doc_path.stat()
+    os.utime(doc_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert not cache.is_fresh(doc_path)
+    assert cache.get(doc_path) is None
+
+
+def test_parse_cache_invalidated_by_settings_change(tmp_path):
+    doc_path = _write(tmp_path / "doc.txt", "hello")
+    ParseCache("settings-1", path=tmp_path / "cache.db").put(doc_path, [Document(page_content="hello")])
+
+    cache = ParseCache("settings-2", path=tmp_path / "cache.db")
+
+    assert not cache.is_fresh(doc_path)
+    assert cache.get(doc_path) is None
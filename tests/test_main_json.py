@@ -0,0 +1,27 @@
+"""Tests for the machine-readable output of ``main.py query --json``."""
+import json
+import sys
+
+import src.rag
+from main import main
+from src.config import Config
+from src.utils import flush_logs, get_logger
+
+
+def test_query_json_writes_only_json_to_stdout(monkeypatch, capsys):
+    def fake_query_documents(question, load_existing=True):
+        get_logger("tests.fake_query").info("Answering %s", question)
+        return {"question": question, "answer": "42", "sources": [], "num_sources": 0}
+
+    # Set in the module dict directly; getattr would import the real pipeline
+    monkeypatch.setitem(vars(src.rag), "query_documents", fake_query_documents)
+    monkeypatch.setattr(Config, "LOG_STREAM", Config.LOG_STREAM)
+    monkeypatch.setattr(sys, "argv", ["main.py", "query", "-q", "What is it?", "--json", "--no-sources"])
+
+    main()
+    flush_logs()
+    captured = capsys.readouterr()
+
+    assert json.loads(captured.out) == {"question": "What is it?", "answer": "42"}
+    assert "INFO: Using Ollama model" in captured.err
+    assert "Answering What is it?" in captured.err
@@ -1,4 +1,7 @@
 """Test script to verify document retrieval works without LLM."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from src.rag.vector_store import VectorStoreManager
 from src.utils import get_logger
 
@@ -23,13 +26,35 @@ def test_retrieval():
         "What are the key details?"
     ]
 
-    for query in test_queries:
+    # Perform similarity search for all queries in one batch
+    batch_results = vector_store.similarity_search_batch(test_queries, k=3)
+
+    assert len(batch_results) == len(test_queries)
+
+    # Independent single-query searches run concurrently and agree with the batch
+    with ThreadPoolExecutor(max_workers=min(16, len(test_queries))) as executor:
+        concurrent_results = list(executor.map(lambda q: vector_store.similarity_search(q, k=3), test_queries))
+
+    # Compare hits by primary key and text, not just count
+    pk_field = vector_store.vectorstore._primary_field
+
+    def hits(docs):
+        return [(doc.metadata.get(pk_field), doc.page_content) for doc in docs]
+
+    for results, batch in zip(concurrent_results, batch_results):
+        assert hits(results) == hits(batch)
+
+    # Gathered async searches return the same hits as well
+    async def search_all():
+        return await asyncio.gather(*(vector_store.asimilarity_search(q, k=3) for q in test_queries))
+
+    for results, batch in zip(asyncio.run(search_all()), batch_results):
+        assert hits(results) == hits(batch)
+
+    for query, results in zip(test_queries, batch_results):
         print(f"\nQuery: {query}")
         print("-" * 80)
 
-        # Perform similarity search
-        results = vector_store.similarity_search(query, k=3)
-
         print(f"Found {len(results)} relevant chunks:\n")
 
         for i, doc in enumerate(results, 1):